@@ -4,6 +4,27 @@ let currentTab = 'dashboard';
 let charts = {};
 let currentData = {};
 
+// Sales and costs tables are fetched a page at a time (keyset cursors from /sales/page and /costs/page)
+const PAGE_SIZE = 100;
+let salesPage = { rows: [], total: 0, nextAfterId: null };
+let costsPage = { rows: [], total: 0, nextAfterId: null };
+
+function pageUrl(path, nextAfterId) {
+    const params = new URLSearchParams({ limit: PAGE_SIZE });
+    if (nextAfterId !== null) params.set('after_id', nextAfterId);
+    return `${API_BASE}${path}?${params}`;
+}
+
+function loadMoreHTML(state, loader) {
+    if (state.nextAfterId === null) {
+        return `<p class="text-muted">Showing ${state.rows.length} of ${state.total}</p>`;
+    }
+    return `
+        <p class="text-muted">Showing ${state.rows.length} of ${state.total}</p>
+        <button class="btn btn-sm btn-secondary" onclick="${loader}(true)">Load more</button>
+    `;
+}
+
 // Quantity display formatter for EA and KG
 function formatQtyDisplay(productName, unit, quantity) {
     const name = (productName || '').toLowerCase();
@@ -115,6 +136,12 @@ async function loadDashboardData() {
         
         displayDashboardStats(stats);
         
+        // Reports default to the latest month with sales
+        const reportMonth = document.getElementById('report-month');
+        if (reportMonth && !reportMonth.value && stats.latest_month) {
+            reportMonth.value = stats.latest_month;
+        }
+        
         // Load top products
         await loadTopProducts();
         
@@ -187,28 +214,9 @@ function displayDashboardStats(stats) {
 // Load top products
 async function loadTopProducts() {
     try {
-        // Get all sales data instead of month-based report
-        const response = await fetch(`${API_BASE}/sales`);
-        const sales = await response.json();
-        
-        // Calculate top products from all sales data
-        const productStats = {};
-        sales.forEach(sale => {
-            const productName = sale.product_name;
-            if (!productStats[productName]) {
-                productStats[productName] = {
-                    name: productName,
-                    revenue: 0,
-                    quantity: 0
-                };
-            }
-            productStats[productName].revenue += sale.quantity * sale.sale_price;
-            productStats[productName].quantity += sale.quantity;
-        });
-        
-        const topProducts = Object.values(productStats)
-            .sort((a, b) => b.revenue - a.revenue)
-            .slice(0, 5);
+        // Ranked and aggregated on the server: only the top rows are downloaded
+        const response = await fetch(`${API_BASE}/dashboard/top-products?limit=5`);
+        const topProducts = await response.json();
         
         displayTopProducts(topProducts);
     } catch (error) {
@@ -419,15 +427,23 @@ function displayProducts(products) {
     container.innerHTML = tableHTML;
 }
 
-// Load sales data
-async function loadSales() {
+// Load sales data (first page, or the next page when append is true)
+async function loadSales(append = false) {
     try {
-        showLoading('sales-table');
+        if (!append) {
+            showLoading('sales-table');
+            salesPage = { rows: [], total: 0, nextAfterId: null };
+        }
         
-        const response = await fetch(`${API_BASE}/sales`);
-        const sales = await response.json();
+        const response = await fetch(pageUrl('/sales/page', salesPage.nextAfterId));
+        const page = await response.json();
         
-        displaySales(sales);
+        salesPage = {
+            rows: salesPage.rows.concat(page.items),
+            total: page.total,
+            nextAfterId: page.next_after_id
+        };
+        displaySales(salesPage.rows);
         
     } catch (error) {
         console.error('Error loading sales:', error);
@@ -479,18 +495,27 @@ function displaySales(sales) {
     });
     
     tableHTML += '</tbody></table>';
+    tableHTML += loadMoreHTML(salesPage, 'loadSales');
     container.innerHTML = tableHTML;
 }
 
-// Load costs
-async function loadCosts() {
+// Load costs (first page, or the next page when append is true)
+async function loadCosts(append = false) {
     try {
-        showLoading('costs-table');
+        if (!append) {
+            showLoading('costs-table');
+            costsPage = { rows: [], total: 0, nextAfterId: null };
+        }
         
-        const response = await fetch(`${API_BASE}/costs`);
-        const costs = await response.json();
+        const response = await fetch(pageUrl('/costs/page', costsPage.nextAfterId));
+        const page = await response.json();
         
-        displayCosts(costs);
+        costsPage = {
+            rows: costsPage.rows.concat(page.items),
+            total: page.total,
+            nextAfterId: page.next_after_id
+        };
+        displayCosts(costsPage.rows);
         
     } catch (error) {
         console.error('Error loading costs:', error);
@@ -545,6 +570,7 @@ function displayCosts(costs) {
     });
     
     tableHTML += '</tbody></table>';
+    tableHTML += loadMoreHTML(costsPage, 'loadCosts');
     container.innerHTML = tableHTML;
 }
 
@@ -946,72 +972,38 @@ function displayAllocationResults(result) {
 }
 
 // Report functions
+function selectedReportMonth() {
+    const input = document.getElementById('report-month');
+    return input ? input.value : '';
+}
+
 async function generateReport() {
+    const month = selectedReportMonth();
+    
+    if (!month) {
+        showAlert('Please select a month', 'error');
+        return;
+    }
+    
     try {
         showLoading('report-results');
         
-        // Get all data instead of month-based report
-        const [salesResponse, costsResponse] = await Promise.all([
-            fetch(`${API_BASE}/sales`),
-            fetch(`${API_BASE}/costs`)
-        ]);
-        
-        const sales = await salesResponse.json();
-        const costs = await costsResponse.json();
-        
-        // Generate report from all data
-        const result = generateReportFromData(sales, costs);
-        displayReportResults(result);
+        // The month's report is built (and cached) on the server
+        const response = await fetch(`${API_BASE}/report/${encodeURIComponent(month)}`);
         
+        if (response.ok) {
+            displayReportResults(await response.json());
+        } else {
+            const error = await response.json();
+            document.getElementById('report-results').innerHTML = '';
+            showAlert(error.detail || 'Error generating report', 'error');
+        }
     } catch (error) {
         console.error('Error generating report:', error);
         showAlert('Error generating report', 'error');
     }
 }
 
-function generateReportFromData(sales, costs) {
-    // Calculate totals
-    const totalRevenue = sales.reduce((sum, sale) => sum + (sale.quantity * sale.sale_price), 0);
-    const totalDirectCosts = sales.reduce((sum, sale) => sum + sale.direct_cost, 0);
-    const totalSharedCosts = costs.reduce((sum, cost) => sum + cost.amount, 0);
-    const totalCosts = totalDirectCosts + totalSharedCosts;
-    const totalProfit = totalRevenue - totalCosts;
-    
-    // Group by product
-    const productStats = {};
-    sales.forEach(sale => {
-        const productName = sale.product_name;
-        if (!productStats[productName]) {
-            productStats[productName] = {
-                name: productName,
-                quantity: 0,
-                revenue: 0,
-                direct_cost: 0,
-                source: sale.product?.source || 'unknown'
-            };
-        }
-        productStats[productName].quantity += sale.quantity;
-        productStats[productName].revenue += sale.quantity * sale.sale_price;
-        productStats[productName].direct_cost += sale.direct_cost;
-    });
-    
-    // Calculate top products
-    const topProducts = Object.values(productStats)
-        .sort((a, b) => b.revenue - a.revenue)
-        .slice(0, 10);
-    
-    return {
-        total_revenue: totalRevenue,
-        total_costs: totalCosts,
-        total_profit: totalProfit,
-        total_direct_costs: totalDirectCosts,
-        total_shared_costs: totalSharedCosts,
-        top_products: topProducts,
-        product_count: Object.keys(productStats).length,
-        sales_count: sales.length
-    };
-}
-
 function displayReportResults(result) {
     const container = document.getElementById('report-results');
     
@@ -1089,62 +1081,11 @@ function displayReportResults(result) {
 }
 
 // Export functions
-async function exportReport() {
-    try {
-        // Get all data and generate CSV
-        const [salesResponse, costsResponse] = await Promise.all([
-            fetch(`${API_BASE}/sales`),
-            fetch(`${API_BASE}/costs`)
-        ]);
-        
-        const sales = await salesResponse.json();
-        const costs = await costsResponse.json();
-        
-        // Generate CSV content
-        const csvContent = generateCSVContent(sales, costs);
-        
-        // Create download link
-        const blob = new Blob([csvContent], { type: 'text/csv' });
-        const url = window.URL.createObjectURL(blob);
-        const link = document.createElement('a');
-        link.href = url;
-        link.download = `report_all_data.csv`;
-        link.click();
-        
-        // Clean up
-        window.URL.revokeObjectURL(url);
-        
-        showAlert('Report exported successfully!', 'success');
-        
-    } catch (error) {
-        console.error('Error exporting report:', error);
-        showAlert('Error exporting report', 'error');
-    }
-}
-
-function generateCSVContent(sales, costs) {
-    let csv = 'Product,Source,Quantity,Price,Revenue,Direct Cost,Month\n';
-    
-    sales.forEach(sale => {
-        const productName = sale.product_name || 'Unknown';
-        const source = sale.product?.source || 'unknown';
-        const quantity = sale.quantity || 0;
-        const price = sale.sale_price || 0;
-        const revenue = quantity * price;
-        const directCost = sale.direct_cost || 0;
-        const month = sale.month || 'Unknown';
-        
-        csv += `"${productName}","${source}",${quantity},${price},${revenue},${directCost},"${month}"\n`;
-    });
-    
-    csv += '\nCosts\n';
-    csv += 'Name,Amount,Type,Month\n';
-    
-    costs.forEach(cost => {
-        csv += `"${cost.name}",${cost.amount},"${cost.type}","${cost.month}"\n`;
-    });
-    
-    return csv;
+function exportReport() {
+    // The CSV is streamed straight back as a download: the selected month, or all months
+    const month = selectedReportMonth();
+    const params = month ? `?${new URLSearchParams({ month })}` : '';
+    window.location.href = `${API_BASE}/export/csv${params}`;
 }
 
 // Utility functions
@@ -1562,27 +1503,20 @@ function showUploadResults(result) {
 
 async function updateDataPreview() {
     try {
-        // Get current dashboard stats and sales data
-        const [statsResponse, salesResponse] = await Promise.all([
-            fetch(`${API_BASE}/dashboard/stats`),
-            fetch(`${API_BASE}/sales`)
-        ]);
-        
+        // Current database totals, aggregated on the server
+        const statsResponse = await fetch(`${API_BASE}/dashboard/stats`);
         const stats = await statsResponse.json();
-        const sales = await salesResponse.json();
-        
-        // Calculate inhouse production from sales data
-        const inhouseProduction = sales.reduce((sum, sale) => sum + (sale.inhouse_production || 0), 0);
+        const inhouseProduction = stats.inhouse_production || 0;
         
         // Update preview cards with current database state
         document.getElementById('preview-products-count').textContent = stats.total_products || 0;
-        document.getElementById('preview-sales-count').textContent = sales.length || 0;
+        document.getElementById('preview-sales-count').textContent = stats.total_sales || 0;
         document.getElementById('preview-revenue').textContent = `₹${(stats.total_revenue || 0).toLocaleString()}`;
         document.getElementById('preview-production').textContent = `${inhouseProduction.toFixed(1)} kg`;
         
         console.log('Data preview updated:', {
             products: stats.total_products,
-            sales: sales.length,
+            sales: stats.total_sales,
             revenue: stats.total_revenue,
             production: inhouseProduction
         });
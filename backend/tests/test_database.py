@@ -0,0 +1,56 @@
+"""Dialect-specific write paths: upsert_sales (INSERT ... ON CONFLICT) and bulk_insert (COPY on PostgreSQL)"""
+import pandas as pd
+
+N_SALES = 2500  # more than one executemany page
+
+
+def sales_frame(product_ids, quantity):
+    return pd.DataFrame({
+        "product_id": product_ids,
+        "month": "2025-04",
+        "quantity": quantity,
+        "sale_price": 10.0,
+        "direct_cost": None,
+        "inward_quantity": 0.0,
+        "inward_rate": 0.0,
+        "inward_value": 0.0,
+        "inhouse_production": 0.0,
+        "wastage": 0.0,
+    })
+
+
+def test_upsert_sales_counts_inserts_and_updates(database, db):
+    records = pd.DataFrame({
+        "product_name": [f"Product {i}" for i in range(N_SALES)],
+        "source": "inhouse",
+        "unit": "KG",
+    })
+    product_ids, created = database.upsert_products(db, records)
+    assert created == N_SALES
+    ids = records["product_name"].map(product_ids)
+
+    assert database.upsert_sales(db, sales_frame(ids, 1.0)) == (N_SALES, 0)
+    db.commit()
+    # Unchanged rows are neither inserted nor updated; direct_cost stays NULL on both sides
+    assert database.upsert_sales(db, sales_frame(ids, 1.0)) == (0, 0)
+    quantities = [2.0 if i % 2 else 1.0 for i in range(N_SALES)]
+    assert database.upsert_sales(db, sales_frame(ids, quantities)) == (0, N_SALES // 2)
+    db.commit()
+
+    stored = db.query(database.MonthlySale.quantity).all()
+    assert len(stored) == N_SALES
+    assert sum(quantity for (quantity,) in stored) == sum(quantities)
+
+
+def test_bulk_insert_fills_column_defaults(database, db):
+    database.bulk_insert(db, database.Cost, [
+        {"name": f"Cost {i}", "amount": 100.0 + i, "month": "2025-04"} for i in range(50)
+    ])
+    db.commit()
+    costs = db.query(database.Cost).order_by(database.Cost.id).all()
+    assert len(costs) == 50
+    assert costs[0].source_file == "manual"
+    assert costs[0].category == "general"
+    assert costs[-1].created_at is not None
+    # Not an ORM write, but it still moves the data version
+    assert database.data_version.current(db) == 1
@@ -0,0 +1,66 @@
+"""Background jobs recovered after a restart must not repeat writes that already committed"""
+import json
+import shutil
+import time
+
+import pytest
+from openpyxl import Workbook
+
+
+@pytest.fixture
+def pl_workbook(tmp_path):
+    path = tmp_path / "pl.xlsx"
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Profit & Loss A/c", None, "1-Apr-25 to 30-Apr-25"])
+    sheet.append(["Rent", 1000])
+    sheet.append(["Cultivation Expenses I", 500])
+    sheet.append(["Vehicle Fuels B", 250])
+    workbook.save(path)
+    return path
+
+
+def pl_costs(database):
+    with database.SessionLocal() as session:
+        return session.query(database.Cost).filter(database.Cost.source_file == "pl_upload").count()
+
+
+def wait_for(database, job_id):
+    for _ in range(100):
+        job = database.job_queue.get(job_id)
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_recovered_pl_job_does_not_import_costs_twice(database, pl_workbook, tmp_path):
+    # The handler committed, then the server died before the job was marked done
+    spooled = tmp_path / "spooled.xlsx"
+    shutil.copy(pl_workbook, spooled)
+    with database.SessionLocal() as session:
+        assert database.parse_purple_patch_pl(str(pl_workbook), session)["costs_created"] == 3
+        job = database.Job(kind="upload-pl", status="running",
+                           params=json.dumps({"path": str(spooled), "filename": "pl.xlsx", "month": None}))
+        session.add(job)
+        session.commit()
+        job_id = job.id
+
+    assert database.job_queue.recover() == 1
+    job = wait_for(database, job_id)
+    assert job["status"] == "succeeded"
+    assert job["result"]["costs_created"] == 0
+    assert pl_costs(database) == 3
+
+
+def test_pl_upload_runs_again_after_other_writes(client, database, pl_workbook):
+    def upload():
+        with open(pl_workbook, "rb") as workbook:
+            return client.post("/api/upload-pl", files={"file": ("pl.xlsx", workbook)}).json()
+
+    assert upload()["costs_created"] == 3
+    assert "duplicate_of" in upload()
+    cost_id = client.get("/api/costs").json()[0]["id"]
+    assert client.delete(f"/api/costs/{cost_id}").status_code == 200
+    assert upload()["costs_created"] == 3
+    assert pl_costs(database) == 5
@@ -0,0 +1,20 @@
+"""Per-route database metrics count the rows ordinary endpoints read, not only streamed exports"""
+import re
+
+from conftest import seed_month
+
+
+def rows_read(client, route: str) -> int:
+    text = client.get("/api/metrics").text
+    match = re.search(rf'^http_request_db_rows_read_total{{method="GET",route="{re.escape(route)}"}} (\d+)$', text, re.M)
+    return int(match.group(1)) if match else 0
+
+
+def test_rows_read_counts_fetched_rows(client, db):
+    seed_month(db, "2025-04", n_products=30, n_costs=0)
+    before = rows_read(client, "/api/sales/page")
+    page = client.get("/api/sales/page?limit=20&month=2025-04")
+    assert page.status_code == 200
+    assert len(page.json()["items"]) == 20
+    # The page rows plus at least the total count
+    assert rows_read(client, "/api/sales/page") - before >= 21
@@ -0,0 +1,64 @@
+"""P&L uploads: which sheets are read and which month their costs go under"""
+import datetime
+
+import pytest
+from openpyxl import Workbook
+
+from conftest import seed_month
+
+
+@pytest.fixture
+def upload_pl(client, tmp_path):
+    def _upload(workbook: Workbook, **params):
+        path = tmp_path / "pl.xlsx"
+        workbook.save(path)
+        with open(path, "rb") as pl_file:
+            response = client.post("/api/upload-pl", files={"file": ("pl.xlsx", pl_file)}, params=params)
+        assert response.status_code == 200, response.text
+        return response.json()
+    return _upload
+
+
+def pl_months(client):
+    return sorted(cost["month"] for cost in client.get("/api/costs").json() if cost["source_file"] == "pl_upload")
+
+
+def test_later_sheets_are_read_only_when_they_are_pls(client, upload_pl):
+    workbook = Workbook()
+    april = workbook.active
+    april.append(["Profit & Loss A/c", None, "1-Apr-25 to 30-Apr-25"])
+    april.append(["Rent", 1000])
+    april.append(["Cultivation Expenses I", 500])
+    may = workbook.create_sheet("May")
+    may.append(["Period", datetime.datetime(2025, 5, 1)])
+    may.append(["Rent", 1100])
+    may.append(["Round Off", 1])
+    balance_sheet = workbook.create_sheet("Balance Sheet")
+    balance_sheet.append(["Balance Sheet", "31-Mar-25"])
+    balance_sheet.append(["Capital Account", 500000])
+    balance_sheet.append(["Sundry Creditors", 120000])
+    balance_sheet.append(["Cash-in-Hand", 4000])
+
+    result = upload_pl(workbook)
+    assert result["success"], result
+    assert pl_months(client) == ["2025-04", "2025-04", "2025-05", "2025-05"]
+
+
+def test_pl_without_a_period_uses_the_month_given(client, upload_pl):
+    workbook = Workbook()
+    workbook.active.append(["Rent", 1000])
+    assert upload_pl(workbook, month="2025-06")["costs_created"] == 1
+    assert pl_months(client) == ["2025-06"]
+
+
+def test_pl_without_a_period_falls_back_to_the_latest_sales_month(client, db, upload_pl):
+    workbook = Workbook()
+    workbook.active.append(["Rent", 1000])
+    assert not upload_pl(workbook)["success"]
+
+    seed_month(db, "2025-04", n_products=3, n_costs=0)
+    seed_month(db, "2025-05", n_products=3, n_costs=0)
+    result = upload_pl(workbook)
+    assert result["success"], result
+    assert "2025-05" in result["message"]
+    assert pl_months(client) == ["2025-05"]
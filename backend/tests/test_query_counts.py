@@ -0,0 +1,50 @@
+"""Listing, dashboard and report endpoints run a fixed number of queries, whatever the catalogue size"""
+import pytest
+
+from conftest import count_queries, seed_month
+
+SMALL_MONTH, LARGE_MONTH = "2025-04", "2025-05"
+ENDPOINTS = [
+    "/api/sales/page?limit=20&month={month}",
+    "/api/costs/page?limit=20&month={month}",
+    "/api/dashboard/stats?month={month}",
+    "/api/dashboard/top-products?limit=5&month={month}",
+    "/api/report/{month}",
+    "/api/excel-preview?month={month}",
+]
+MAX_QUERIES = 6
+
+
+@pytest.fixture
+def two_sizes(client, db, database):
+    """A month with 5 products and a month with 150, both allocated"""
+    seed_month(db, SMALL_MONTH, n_products=5, n_costs=3)
+    seed_month(db, LARGE_MONTH, n_products=150, n_costs=40)
+    for month in (SMALL_MONTH, LARGE_MONTH):
+        assert client.post(f"/api/allocate/{month}").status_code == 200
+    return client
+
+
+def queries_for(client, database, path):
+    # Allocation runs leave reports cached: count a cold build
+    database.report_cache._entries.clear()
+    with count_queries() as queries:
+        response = client.get(path)
+    assert response.status_code == 200, response.text
+    return queries[0]
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_query_count_does_not_grow_with_rows(two_sizes, database, endpoint):
+    small = queries_for(two_sizes, database, endpoint.format(month=SMALL_MONTH))
+    large = queries_for(two_sizes, database, endpoint.format(month=LARGE_MONTH))
+    assert small == large
+    assert large <= MAX_QUERIES
+
+
+def test_cached_report_reads_only_the_data_version(two_sizes, database):
+    path = f"/api/report/{LARGE_MONTH}"
+    queries_for(two_sizes, database, path)
+    with count_queries() as queries:
+        assert two_sizes.get(path).status_code == 200
+    assert queries[0] == 1
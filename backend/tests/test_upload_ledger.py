@@ -0,0 +1,60 @@
+"""Repeated sales uploads: only a repeat of the latest upload with no writes since is skipped"""
+import io
+
+import pandas as pd
+import pytest
+
+
+def workbook(quantity: float) -> bytes:
+    buffer = io.BytesIO()
+    pd.DataFrame({
+        "Month": ["2025-04", "2025-04"],
+        "Particulars": ["Tomato", "Carrot"],
+        "Type": ["Inhouse", "Inhouse"],
+        "Outward Quantity": [quantity, 20.0],
+        "Outward Eff. Rate": [30.0, 80.0],
+    }).to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def quantities(client) -> dict:
+    return {sale["product_name"]: sale["quantity"] for sale in client.get("/api/sales").json()}
+
+
+@pytest.fixture
+def upload(client):
+    def _upload(content: bytes, filename: str = "sales.xlsx"):
+        response = client.post("/api/upload-excel", files={"file": (filename, content)})
+        assert response.status_code == 200, response.text
+        assert response.json()["success"], response.json()
+        return response.json()
+    return _upload
+
+
+def test_repeat_of_latest_upload_is_skipped(upload):
+    # The same bytes: a workbook saved again gets a new timestamp, so a new hash
+    content = workbook(10.0)
+    assert upload(content)["sales_created"] == 2
+    assert "duplicate_of" in upload(content)
+
+
+def test_older_file_runs_again_after_another_upload(client, upload):
+    content = workbook(10.0)
+    upload(content, "a.xlsx")
+    upload(workbook(15.0), "b.xlsx")
+    again = upload(content, "a.xlsx")
+    assert "duplicate_of" not in again
+    assert again["sales_updated"] == 1  # only Tomato differs between the files
+    assert quantities(client)["Tomato (Inhouse)"] == 10.0
+
+
+def test_repeat_runs_again_after_an_edit(client, upload):
+    content = workbook(10.0)
+    upload(content)
+    sale = next(s for s in client.get("/api/sales").json() if s["product_name"] == "Tomato (Inhouse)")
+    edited = client.put(f"/api/monthly-sales/{sale['id']}", json={
+        "product_id": sale["product_id"], "month": sale["month"], "quantity": 99.0, "sale_price": sale["sale_price"]
+    })
+    assert edited.status_code == 200, edited.text
+    assert "duplicate_of" not in upload(content)
+    assert quantities(client)["Tomato (Inhouse)"] == 10.0